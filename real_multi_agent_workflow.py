@@ -30,6 +30,10 @@ from agents.review_agent import ReviewAgent
 from agents.execution_agent import ExecutionAgent
 from agents.reporting_agent import ReportingAgent
 
+# Artifacts that are read by humans and therefore written pretty-printed.
+# Everything else is only consumed by other agents, so it is written compact.
+_PRETTY_ARTIFACTS = {"test_plan"}
+
 class RealMultiAgentWorkflow:
     """
     Real Multi-Agent Workflow
@@ -37,8 +41,16 @@ class RealMultiAgentWorkflow:
     This class orchestrates the workflow between all six agents in the AI test automation framework.
     """
     
-    def __init__(self):
-        """Initialize the real multi-agent workflow"""
+    def __init__(self, persist_artifacts: bool = True):
+        """
+        Initialize the real multi-agent workflow
+        
+        Args:
+            persist_artifacts: Write JSON artifacts and the HTML report to disk.
+                Disable for programmatic runs that only use the returned results.
+        """
+        self._persist = persist_artifacts
+        
         # Create agents
         logger.info("Initializing agents...")
         self.planning_agent = PlanningAgent()
@@ -58,6 +70,18 @@ class RealMultiAgentWorkflow:
         for directory in [self.work_dir, self.reports_dir, self.screenshots_dir, self.tests_dir, self.pages_dir]:
             directory.mkdir(exist_ok=True)
     
+    def _write_json_artifact(self, path: Path, artifact_prefix: str, data: Any) -> bool:
+        """Write a JSON artifact, indenting only the human-facing ones"""
+        if not self._persist:
+            return False
+        
+        with open(path, 'w') as f:
+            if artifact_prefix in _PRETTY_ARTIFACTS:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f)
+        return True
+    
     async def run_workflow(self, application_url: str, application_name: str) -> Dict[str, Any]:
         """
         Run the complete workflow
@@ -145,10 +169,8 @@ class RealMultiAgentWorkflow:
             # Save test plan
             test_plan = result.get("test_plan", {})
             test_plan_path = self.work_dir / f"test_plan_{application_name.lower().replace(' ', '_')}.json"
-            with open(test_plan_path, 'w') as f:
-                json.dump(test_plan, f, indent=2)
-            
-            logger.info(f"Test plan created: {test_plan_path}")
+            if self._write_json_artifact(test_plan_path, "test_plan", test_plan):
+                logger.info(f"Test plan created: {test_plan_path}")
             
             return test_plan
             
@@ -167,10 +189,8 @@ class RealMultiAgentWorkflow:
             # Save discovery results
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             discovery_results_path = self.work_dir / f"discovery_results_{timestamp}.json"
-            with open(discovery_results_path, 'w') as f:
-                json.dump(discovery_results, f, indent=2)
-            
-            logger.info(f"Discovery results created: {discovery_results_path}")
+            if self._write_json_artifact(discovery_results_path, "discovery_results", discovery_results):
+                logger.info(f"Discovery results created: {discovery_results_path}")
             
             return discovery_results
             
@@ -201,10 +221,8 @@ class RealMultiAgentWorkflow:
             # Save test creation results
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             test_creation_results_path = self.work_dir / f"test_creation_results_{timestamp}.json"
-            with open(test_creation_results_path, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            logger.info(f"Test creation results created: {test_creation_results_path}")
+            if self._write_json_artifact(test_creation_results_path, "test_creation_results", result):
+                logger.info(f"Test creation results created: {test_creation_results_path}")
             
             # Copy generated files to proper directories
             generated_files = result.get("generated_files", [])
@@ -255,10 +273,8 @@ class RealMultiAgentWorkflow:
             # Save review results
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             review_results_path = self.work_dir / f"review_results_{timestamp}.json"
-            with open(review_results_path, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            logger.info(f"Review results created: {review_results_path}")
+            if self._write_json_artifact(review_results_path, "review_results", result):
+                logger.info(f"Review results created: {review_results_path}")
             
             return result
             
@@ -291,10 +307,8 @@ class RealMultiAgentWorkflow:
             # Save execution results
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             execution_results_path = self.work_dir / f"execution_results_{timestamp}.json"
-            with open(execution_results_path, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            logger.info(f"Execution results created: {execution_results_path}")
+            if self._write_json_artifact(execution_results_path, "execution_results", result):
+                logger.info(f"Execution results created: {execution_results_path}")
             
             return result
             
@@ -320,7 +334,7 @@ class RealMultiAgentWorkflow:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_path = self.reports_dir / f"test_report_{timestamp}.html"
             
-            if "report_content" in result:
+            if self._persist and "report_content" in result:
                 with open(report_path, 'w') as f:
                     f.write(result["report_content"])
                 
@@ -338,10 +352,11 @@ async def main():
     parser = argparse.ArgumentParser(description="Real Multi-Agent Workflow")
     parser.add_argument("--url", "-u", required=True, help="URL of the application to test")
     parser.add_argument("--name", "-n", required=True, help="Name of the application")
+    parser.add_argument("--no-persist", action="store_true", help="Do not write JSON artifacts or the HTML report to disk")
     args = parser.parse_args()
     
     # Create workflow
-    workflow = RealMultiAgentWorkflow()
+    workflow = RealMultiAgentWorkflow(persist_artifacts=not args.no_persist)
     
     # Run workflow
     workflow_results = await workflow.run_workflow(args.url, args.name)
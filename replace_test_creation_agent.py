@@ -6,7 +6,7 @@ This script replaces the original template-based Test Creation Agent
 with the Enhanced version that generates real working code.
 """
 
-import shutil
+import re
 import os
 from pathlib import Path
 import logging
@@ -15,33 +15,62 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Old import line, matched on raw bytes so files are never decoded
+_IMPORT_RE = re.compile(rb"from agents\.test_creation_agent import TestCreationAgent\b")
+_IMPORT_REPLACEMENT = b"from agents.test_creation_agent import EnhancedTestCreationAgent as TestCreationAgent"
+
+def list_directory(directory: str) -> set:
+    """Return the entry names in a directory with a single scandir call"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
 def replace_test_creation_agent():
     """Replace the original Test Creation Agent with Enhanced version"""
     
+    # Only needed for the replacement itself, so kept off the import path
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+    
     logger.info("🔄 Starting Test Creation Agent replacement process")
     
     # File paths
     original_agent = Path("agents/test_creation_agent.py")
     enhanced_agent = Path("agents/enhanced_test_creation_agent.py")
     backup_agent = Path("agents/test_creation_agent_original_backup.py")
+    temp_agent = Path("agents/test_creation_agent.py.tmp")
     
     try:
-        # Step 1: Backup original agent
-        if original_agent.exists():
+        # One directory scan instead of a stat per existence check
+        agent_files = list_directory("agents")
+        
+        # Step 1: Verify enhanced agent exists, before touching the backup
+        if enhanced_agent.name not in agent_files:
+            logger.error("❌ Enhanced Test Creation Agent not found: %s", enhanced_agent)
+            return False
+        
+        # Step 2: Backup original agent
+        if original_agent.name in agent_files:
             logger.info("📦 Creating backup of original Test Creation Agent")
-            shutil.copy2(original_agent, backup_agent)
-            logger.info(f"✅ Backup created: {backup_agent}")
+            # A hard link backs up the original without copying any data
+            if backup_agent.name in agent_files:
+                os.unlink(backup_agent)
+            try:
+                os.link(original_agent, backup_agent)
+            except OSError:
+                shutil.copy2(original_agent, backup_agent)
+            logger.info("✅ Backup created: %s", backup_agent)
         else:
             logger.warning("⚠️ Original Test Creation Agent not found")
         
-        # Step 2: Verify enhanced agent exists
-        if not enhanced_agent.exists():
-            logger.error(f"❌ Enhanced Test Creation Agent not found: {enhanced_agent}")
-            return False
-        
         # Step 3: Replace original with enhanced
         logger.info("🔄 Replacing original Test Creation Agent with Enhanced version")
-        shutil.copy2(enhanced_agent, original_agent)
+        # Swap in a new inode atomically; copying onto original_agent in place
+        # would also overwrite the hard-linked backup
+        shutil.copy2(enhanced_agent, temp_agent)
+        os.replace(temp_agent, original_agent)
         logger.info("✅ Replacement completed successfully")
         
         # Step 4: Update imports in other files
@@ -55,20 +84,24 @@ def replace_test_creation_agent():
             "enhanced_main_framework.py"
         ]
         
-        for file_path in files_to_update:
-            if Path(file_path).exists():
-                update_imports_in_file(file_path)
+        # Files are independent, so overlap their disk I/O
+        present = list_directory(".")
+        existing_files = [file_path for file_path in files_to_update if file_path in present]
+        if existing_files:
+            with ThreadPoolExecutor(max_workers=min(4, len(existing_files))) as executor:
+                list(executor.map(update_imports_in_file, existing_files))
         
         logger.info("✅ All imports updated successfully")
         
         # Step 5: Verify the replacement
         logger.info("🔍 Verifying replacement")
         
-        # Check if the new file has Enhanced features
-        with open(original_agent, 'r') as f:
-            content = f.read()
+        # Check if the new file has Enhanced features; the class declaration
+        # sits near the top of the module, so the first block is enough
+        with open(original_agent, 'rb') as f:
+            head = f.read(4096)
         
-        if "EnhancedTestCreationAgent" in content:
+        if b"EnhancedTestCreationAgent" in head:
             logger.info("✅ Verification successful: Enhanced features detected")
         else:
             logger.warning("⚠️ Verification warning: Enhanced features not detected")
@@ -78,18 +111,23 @@ def replace_test_creation_agent():
         
         logger.info("🎉 Test Creation Agent replacement completed successfully!")
         logger.info("📋 Summary:")
-        logger.info(f"   - Original agent backed up to: {backup_agent}")
-        logger.info(f"   - Enhanced agent now active as: {original_agent}")
-        logger.info(f"   - Updated imports in {len(files_to_update)} files")
-        logger.info(f"   - Created integration test")
+        logger.info("   - Original agent backed up to: %s", backup_agent)
+        logger.info("   - Enhanced agent now active as: %s", original_agent)
+        logger.info("   - Updated imports in %d files", len(files_to_update))
+        logger.info("   - Created integration test")
         
         return True
         
     except Exception as e:
-        logger.error(f"❌ Replacement failed: {str(e)}")
+        logger.error("❌ Replacement failed: %s", e)
+        
+        # Drop a half-written replacement, if any
+        if temp_agent.exists():
+            os.unlink(temp_agent)
         
-        # Restore from backup if replacement failed
-        if backup_agent.exists() and original_agent.exists():
+        # Restore from backup if replacement failed; while the backup is still
+        # a hard link to the original, the original was never touched
+        if backup_agent.exists() and original_agent.exists() and not os.path.samefile(backup_agent, original_agent):
             logger.info("🔄 Restoring from backup due to failure")
             shutil.copy2(backup_agent, original_agent)
             logger.info("✅ Restored original agent from backup")
@@ -100,36 +138,26 @@ def update_imports_in_file(file_path: str):
     """Update imports in a file to use the new agent"""
     
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Update class name references
-        updated_content = content.replace(
-            "from agents.test_creation_agent import TestCreationAgent",
-            "from agents.test_creation_agent import EnhancedTestCreationAgent as TestCreationAgent"
-        )
-        
-        # Also handle direct class references
-        updated_content = updated_content.replace(
-            "TestCreationAgent(",
-            "TestCreationAgent("  # This will now refer to Enhanced version
-        )
-        
-        # Write back if changes were made
-        if updated_content != content:
-            with open(file_path, 'w') as f:
-                f.write(updated_content)
-            logger.info(f"✅ Updated imports in: {file_path}")
+        path = Path(file_path)
+        
+        # Update class name references in a single pass; direct
+        # TestCreationAgent( calls then resolve to the Enhanced version
+        updated_content, count = _IMPORT_RE.subn(_IMPORT_REPLACEMENT, path.read_bytes())
+        
+        # Write back only if changes were made
+        if count:
+            path.write_bytes(updated_content)
+            logger.info("✅ Updated imports in: %s", file_path)
         else:
-            logger.info(f"ℹ️ No import updates needed in: {file_path}")
+            logger.info("ℹ️ No import updates needed in: %s", file_path)
             
     except Exception as e:
-        logger.warning(f"⚠️ Could not update imports in {file_path}: {str(e)}")
+        logger.warning("⚠️ Could not update imports in %s: %s", file_path, e)
 
-def create_integration_test():
-    """Create integration test to verify the replacement works"""
-    
-    integration_test = """#!/usr/bin/env python3
+# Source of the generated integration test. It contains non-ASCII characters,
+# so it cannot be a bytes literal; it is encoded once at import time and only
+# the bytes are kept.
+_INTEGRATION_TEST_BYTES = """#!/usr/bin/env python3
 \"\"\"
 Integration Test for Enhanced Test Creation Agent Replacement
 ===========================================================
@@ -274,10 +302,12 @@ async def main():
 
 if __name__ == "__main__":
     asyncio.run(main())
-"""
+""".encode("utf-8")
+
+def create_integration_test():
+    """Create integration test to verify the replacement works"""
     
-    with open("test_enhanced_integration.py", 'w') as f:
-        f.write(integration_test)
+    Path("test_enhanced_integration.py").write_bytes(_INTEGRATION_TEST_BYTES)
     
     logger.info("✅ Created integration test: test_enhanced_integration.py")
 
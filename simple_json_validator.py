@@ -4,8 +4,72 @@ Simple JSON validator to replace jsonschema dependency
 Provides basic validation for test scenario JSON files
 """
 
+import os
+import sys
 import json
-from typing import Dict, Any, List, Optional, Union
+import mmap
+from copy import deepcopy
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+# Use orjson's C parser when available, fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Files above this size are parsed straight from a memory map
+MMAP_THRESHOLD = 1024 * 1024
+READ_BUFFER_SIZE = 64 * 1024
+
+def _loads(raw) -> Any:
+    """Parse JSON from bytes-like data"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
+
+def _load_json_file(file_path: str, size: int) -> Any:
+    """Read a JSON file in one binary read (or mmap for large files) and parse it"""
+    with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        if size <= MMAP_THRESHOLD:
+            return _loads(f.read())
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _loads(view)
+
+# Marks a field that is absent, so one dict.get replaces "in" plus indexing
+_SENTINEL = object()
+
+# Interned validation codes, shared by every error tuple that reports them
+_ERR_MISSING = sys.intern("missing_required_field")
+_ERR_TYPE = sys.intern("wrong_field_type")
+_ERR_STEP_TYPE = sys.intern("step_not_object")
+_ERR_STEP_ACTION = sys.intern("step_missing_action")
+_ERR_ENV_TIMEOUT = sys.intern("environment_timeout_not_number")
+_WARN_STEP_NUMBER = sys.intern("step_missing_number")
+
+# Message templates for the (code, *args) tuples collected during validation
+_MESSAGES = {
+    _ERR_MISSING: "Missing required field: %s",
+    _ERR_TYPE: "Field '%s' should be of type %s, got %s",
+    _ERR_STEP_TYPE: "Test step %d should be an object",
+    _WARN_STEP_NUMBER: "Test step %d missing 'step' number",
+    _ERR_STEP_ACTION: "Test step %d missing 'action' or 'description'",
+    _ERR_ENV_TIMEOUT: "Environment timeout should be a number",
+}
+
+def _format_errors(errors: List[tuple]) -> List[str]:
+    """Render (code, *args) tuples into human-readable messages"""
+    return [_MESSAGES[error[0]] % error[1:] for error in errors]
+
+def _build_result(errors: List[tuple], warnings: List[tuple]) -> Dict[str, Any]:
+    """Build a validation result; messages are only rendered when present"""
+    return {
+        "valid": not errors,
+        "errors": _format_errors(errors) if errors else errors,
+        "warnings": _format_errors(warnings) if warnings else warnings
+    }
 
 class SimpleJsonValidator:
     """Simple JSON validator for test scenarios"""
@@ -27,58 +91,89 @@ class SimpleJsonValidator:
                 "configuration": dict
             }
         }
+        
+        # Flattened schema so validation iterates tuples instead of dicts
+        self._required = tuple(self.test_scenario_schema["required_fields"])
+        self._types = tuple(self.test_scenario_schema["field_types"].items())
+        
+        # validate_json_file results keyed on (path, mtime_ns, size)
+        self._cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
     
-    def validate_test_scenario(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate a test scenario JSON object"""
+    def validate_test_scenario(self, data: Dict[str, Any], fast_fail: bool = False) -> Dict[str, Any]:
+        """
+        Validate a test scenario JSON object
+        
+        Args:
+            data: Parsed test scenario
+            fast_fail: Return as soon as the first error is found, for callers
+                that only need to know whether the scenario is valid
+        """
         errors = []
         warnings = []
         
         # Check required fields
-        for field in self.test_scenario_schema["required_fields"]:
+        for field in self._required:
             if field not in data:
-                errors.append(f"Missing required field: {field}")
+                errors.append((_ERR_MISSING, field))
+                if fast_fail:
+                    return _build_result(errors, warnings)
         
-        # Check field types
-        for field, expected_type in self.test_scenario_schema["field_types"].items():
-            if field in data:
-                if not isinstance(data[field], expected_type):
-                    errors.append(f"Field '{field}' should be of type {expected_type.__name__}, got {type(data[field]).__name__}")
+        # Check field types (exact type match first, isinstance for subclasses)
+        data_get = data.get
+        for field, expected_type in self._types:
+            value = data_get(field, _SENTINEL)
+            if value is _SENTINEL:
+                continue
+            if type(value) is not expected_type and not isinstance(value, expected_type):
+                errors.append((_ERR_TYPE, field, expected_type.__name__, type(value).__name__))
+                if fast_fail:
+                    return _build_result(errors, warnings)
         
         # Validate test steps structure
-        if "testSteps" in data and isinstance(data["testSteps"], list):
-            for i, step in enumerate(data["testSteps"]):
-                if not isinstance(step, dict):
-                    errors.append(f"Test step {i+1} should be an object")
+        test_steps = data_get("testSteps")
+        if isinstance(test_steps, list):
+            # EAFP does not help here ("step" in "a string" does not raise), so
+            # take an exact-type fast path and fall back to isinstance
+            for i, step in enumerate(test_steps):
+                if type(step) is not dict and not isinstance(step, dict):
+                    errors.append((_ERR_STEP_TYPE, i + 1))
+                    if fast_fail:
+                        return _build_result(errors, warnings)
                     continue
                 
                 if "step" not in step:
-                    warnings.append(f"Test step {i+1} missing 'step' number")
+                    warnings.append((_WARN_STEP_NUMBER, i + 1))
                 
                 if "action" not in step and "description" not in step:
-                    errors.append(f"Test step {i+1} missing 'action' or 'description'")
+                    errors.append((_ERR_STEP_ACTION, i + 1))
+                    if fast_fail:
+                        return _build_result(errors, warnings)
         
         # Validate environment structure if present
-        if "environment" in data and isinstance(data["environment"], dict):
-            env = data["environment"]
-            if "timeout" in env and not isinstance(env["timeout"], (int, float)):
-                errors.append("Environment timeout should be a number")
+        env = data_get("environment")
+        if isinstance(env, dict):
+            timeout = env.get("timeout", _SENTINEL)
+            if timeout is not _SENTINEL and not isinstance(timeout, (int, float)):
+                errors.append((_ERR_ENV_TIMEOUT,))
         
-        return {
-            "valid": len(errors) == 0,
-            "errors": errors,
-            "warnings": warnings
-        }
+        return _build_result(errors, warnings)
     
     def validate_json_file(self, file_path: str) -> Dict[str, Any]:
         """Validate a JSON test scenario file"""
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            st = os.stat(file_path)
+            cache_key = (file_path, st.st_mtime_ns, st.st_size)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return deepcopy(cached)
+            
+            data = _load_json_file(file_path, st.st_size)
             
             validation_result = self.validate_test_scenario(data)
             validation_result["file_path"] = file_path
             validation_result["parsed_data"] = data
             
+            self._cache[cache_key] = deepcopy(validation_result)
             return validation_result
             
         except json.JSONDecodeError as e:
@@ -106,13 +201,14 @@ class SimpleJsonValidator:
 def validate_json_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     """Simple schema validation function to replace jsonschema.validate"""
     validator = SimpleJsonValidator()
-    result = validator.validate_test_scenario(data)
+    result = validator.validate_test_scenario(data, fast_fail=True)
     return result["valid"]
 
 # Compatibility function for existing code
 def validate(instance: Dict[str, Any], schema: Dict[str, Any]) -> None:
     """Compatibility function that raises exception on validation failure"""
     validator = SimpleJsonValidator()
+    # Collect every error, since they all go into the exception message
     result = validator.validate_test_scenario(instance)
     
     if not result["valid"]:
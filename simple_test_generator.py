@@ -11,10 +11,20 @@ import sys
 import json
 import logging
 import argparse
-import re
+import functools
+import io
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+# Use orjson's C parser when available, fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +33,163 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# sanitize_name maps every byte outside [a-zA-Z0-9_] to an underscore with
+# one bytes.translate pass; non-ASCII characters are first encoded as '?'
+_SANITIZE_TABLE = bytes(
+    b if (b < 128 and (chr(b).isalnum() or b == ord('_'))) else ord('_')
+    for b in range(256)
+)
+
+@functools.lru_cache(maxsize=1024)
+def _title_name(name: str) -> str:
+    """Title-case a snake_case name (login_page -> Login Page)"""
+    return name.replace('_', ' ').title()
+
+@functools.lru_cache(maxsize=1024)
+def _camel_name(name: str) -> str:
+    """CamelCase a snake_case name (login_page -> LoginPage)"""
+    return _title_name(name).replace(' ', '')
+
+def _load_json(path: str) -> Any:
+    """Read a JSON file in one binary read and parse it"""
+    raw = Path(path).read_bytes()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Test step renderers by action: (description, target, value, page_var) -> code
+# block for the step, ending with a blank line. Unknown actions are skipped.
+_STEP_RENDERERS = {
+    "navigate": lambda description, target, value, page_var: (
+        f'            # {description}\n'
+        f'            await page.goto("{target}")\n'
+        f'            await page.wait_for_load_state("networkidle")\n\n'
+    ),
+    "click": lambda description, target, value, page_var: (
+        f'            # {description}\n'
+        f'            await {page_var}.click("{target}")\n'
+        f'            await page.wait_for_load_state("networkidle")\n\n'
+    ),
+    "input": lambda description, target, value, page_var: (
+        f'            # {description}\n'
+        f'            await {page_var}.fill("{target}", "{value}")\n\n'
+    ),
+    "assert": lambda description, target, value, page_var: (
+        f'            # {description}\n'
+        f'            assert await {page_var}.is_visible("{target}"), "{description} failed"\n\n'
+    ),
+}
+
+# Generated test module, split around the test steps and rendered with
+# str.format; the steps are streamed between the two halves
+_TEST_HEADER_TEMPLATE = '''"""
+{title_name} Test
+==============
+{test_description}
+"""
+
+import pytest
+import logging
+from datetime import datetime
+
+from pages.{page_module} import {page_class}
+
+class {test_class}:
+    """Test class for {title_name}"""
+    
+    @pytest.mark.asyncio
+    async def test_{test_function}(self, browser_setup):
+        """
+        Test {title_name}
+        
+        Args:
+            browser_setup: Browser setup fixture
+        """
+        page, browser, context, playwright = browser_setup
+        
+        try:
+            # Initialize page object
+            {page_var} = {page_class}(page)
+            
+            # Navigate to page
+            await {page_var}.navigate()
+            
+            # Take screenshot before actions
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            await page.screenshot(path="screenshots/{test_function}_before_" + timestamp + ".png")
+            
+'''
+
+_TEST_FOOTER_TEMPLATE = '''            
+            # Take screenshot after actions
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            await page.screenshot(path="screenshots/{test_function}_after_" + timestamp + ".png")
+            
+{assertions_code}
+            
+        except Exception as e:
+            # Take screenshot on failure
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            await page.screenshot(path="screenshots/{test_function}_failure_" + timestamp + ".png")
+            
+            logging.error("Test failed: {{}}".format(str(e)))
+            raise
+
+# Run test if executed directly
+if __name__ == "__main__":
+    pytest.main(["-xvs", __file__])
+'''
+
+# Generated page object module, rendered with str.format
+_PAGE_TEMPLATE = '''"""
+{page_title} Page Object
+======================
+Page object for {page_title} page.
+"""
+
+from pages.base_page import BasePage
+
+class {page_class}(BasePage):
+    """Page object for {page_title} page"""
+    
+    def __init__(self, page):
+        """
+        Initialize {page_title} page object
+        
+        Args:
+            page: Playwright page object
+        """
+        super().__init__(page)
+        self.url = "{page_url}"  # URL path relative to base URL
+        
+        # Element selectors
+{element_selectors}
+    
+{element_methods}
+'''
+
+def _render_step(step: Dict[str, Any], page_var: str) -> str:
+    """Render one test step as a code block, or an empty string for unknown actions"""
+    render = _STEP_RENDERERS.get(step.get("action", ""))
+    if render is None:
+        return ""
+    return render(step.get("description", ""), step.get("selector", ""),
+                  step.get("value", ""), page_var)
+
+# Buffer size for writing generated test files to disk
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Discovery results with at least this many pages are generated in parallel
+PARALLEL_PAGE_THRESHOLD = 8
+
+@dataclass(frozen=True)
+class PageIdents:
+    """Identifiers derived once from a page name and shared by both generators"""
+    sanitized: str
+    class_name: str
+    module_name: str
+    var_name: str
+
 class SimpleTestGenerator:
     """
     Simple Test Generator
@@ -30,6 +197,9 @@ class SimpleTestGenerator:
     This class generates test files and page objects based on discovered elements.
     """
     
+    # Directories already created by an earlier instance in this process
+    _dirs_created: set = set()
+    
     def __init__(self):
         """Initialize the test generator"""
         # Set up directories
@@ -40,14 +210,21 @@ class SimpleTestGenerator:
         
         # Create directories if they don't exist
         for directory in [self.tests_dir, self.pages_dir, self.screenshots_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+            if directory not in SimpleTestGenerator._dirs_created:
+                directory.mkdir(parents=True, exist_ok=True)
+                SimpleTestGenerator._dirs_created.add(directory)
         
         logger.info("Simple Test Generator initialized")
     
-    def sanitize_name(self, name: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def sanitize_name(name: str) -> str:
         """
         Sanitize a name for use in file names and identifiers
         
+        Results are memoized since page and element names repeat across
+        pages and between the page object and test generators.
+        
         Args:
             name: Name to sanitize
             
@@ -55,13 +232,14 @@ class SimpleTestGenerator:
             Sanitized name
         """
         # Replace special characters with underscores
-        sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+        raw = name.encode('ascii', 'replace').translate(_SANITIZE_TABLE)
         
         # Remove consecutive underscores
-        sanitized = re.sub(r'_+', '_', sanitized)
+        while b'__' in raw:
+            raw = raw.replace(b'__', b'_')
         
         # Remove leading and trailing underscores
-        sanitized = sanitized.strip('_')
+        sanitized = raw.strip(b'_').decode('ascii')
         
         # Ensure it starts with a letter or underscore
         if sanitized and not sanitized[0].isalpha() and sanitized[0] != '_':
@@ -73,12 +251,32 @@ class SimpleTestGenerator:
             
         return sanitized
     
+    def page_idents(self, page_name: str) -> PageIdents:
+        """
+        Derive the identifiers used for a page in generated code
+        
+        Args:
+            page_name: Name of the page
+            
+        Returns:
+            PageIdents: Sanitized name, page object class, module and variable names
+        """
+        sanitized = self.sanitize_name(page_name)
+        module_name = sanitized.lower() + "_page"
+        return PageIdents(
+            sanitized=sanitized,
+            class_name="{}Page".format(_camel_name(sanitized)),
+            module_name=module_name,
+            var_name=module_name
+        )
+    
     def generate_test_file(self, 
                           test_name: str, 
                           test_description: str, 
                           page_name: str, 
                           page_url: str, 
-                          test_steps: List[Dict[str, Any]]) -> str:
+                          test_steps: List[Dict[str, Any]],
+                          idents: Optional[PageIdents] = None) -> str:
         """
         Generate a test file
         
@@ -88,6 +286,7 @@ class SimpleTestGenerator:
             page_name: Name of the page
             page_url: URL of the page
             test_steps: List of test steps
+            idents: Precomputed identifiers for page_name, derived if omitted
             
         Returns:
             str: Path to the generated test file
@@ -96,126 +295,48 @@ class SimpleTestGenerator:
         
         # Sanitize names
         sanitized_test_name = self.sanitize_name(test_name)
-        sanitized_page_name = self.sanitize_name(page_name)
+        if idents is None:
+            idents = self.page_idents(page_name)
         
         # Prepare variables
-        test_class = "Test{}".format(sanitized_test_name.replace('_', ' ').title().replace(' ', ''))
+        test_class = "Test{}".format(_camel_name(sanitized_test_name))
         test_function = sanitized_test_name.lower()
-        page_class = "{}Page".format(sanitized_page_name.replace('_', ' ').title().replace(' ', ''))
-        page_module = sanitized_page_name.lower() + "_page"
-        page_var = sanitized_page_name.lower() + "_page"
-        
-        # Generate test steps
-        steps_code = []
-        for step in test_steps:
-            action = step.get("action", "")
-            target = step.get("selector", "")
-            value = step.get("value", "")
-            description = step.get("description", "")
-            
-            if action == "navigate":
-                steps_code.append("            # {}".format(description))
-                steps_code.append('            await page.goto("{}")'.format(target))
-                steps_code.append('            await page.wait_for_load_state("networkidle")')
-                steps_code.append("")
-            elif action == "click":
-                steps_code.append("            # {}".format(description))
-                steps_code.append('            await {}.click("{}")'.format(page_var, target))
-                steps_code.append('            await page.wait_for_load_state("networkidle")')
-                steps_code.append("")
-            elif action == "input":
-                steps_code.append("            # {}".format(description))
-                steps_code.append('            await {}.fill("{}", "{}")'.format(page_var, target, value))
-                steps_code.append("")
-            elif action == "assert":
-                steps_code.append("            # {}".format(description))
-                steps_code.append('            assert await {}.is_visible("{}"), "{} failed"'.format(page_var, target, description))
-                steps_code.append("")
+        page_class = idents.class_name
+        page_module = idents.module_name
+        page_var = idents.var_name
+        title_name = _title_name(test_name)
         
         # Generate assertions
         assertions = []
         assertions.append("            # Add assertions here")
         assertions.append('            assert await page.title() != "", "Page title should not be empty"')
-        
-        # Create test file content
-        test_content = '''"""
-{} Test
-==============
-{}
-"""
-
-import pytest
-import logging
-from datetime import datetime
-
-from pages.{} import {}
-
-class {}:
-    """Test class for {}"""
-    
-    @pytest.mark.asyncio
-    async def test_{}(self, browser_setup):
-        """
-        Test {}
-        
-        Args:
-            browser_setup: Browser setup fixture
-        """
-        page, browser, context, playwright = browser_setup
-        
-        try:
-            # Initialize page object
-            {} = {}(page)
-            
-            # Navigate to page
-            await {}.navigate()
-            
-            # Take screenshot before actions
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            await page.screenshot(path="screenshots/{}_before_" + timestamp + ".png")
-            
-{}
-            
-            # Take screenshot after actions
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            await page.screenshot(path="screenshots/{}_after_" + timestamp + ".png")
-            
-{}
-            
-        except Exception as e:
-            # Take screenshot on failure
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            await page.screenshot(path="screenshots/{}_failure_" + timestamp + ".png")
-            
-            logging.error("Test failed: {{}}".format(str(e)))
-            raise
-
-# Run test if executed directly
-if __name__ == "__main__":
-    pytest.main(["-xvs", __file__])
-'''.format(
-            test_name.replace('_', ' ').title(),
-            test_description,
-            page_module,
-            page_class,
-            test_class,
-            test_name.replace('_', ' ').title(),
-            test_function,
-            test_name.replace('_', ' ').title(),
-            page_var,
-            page_class,
-            page_var,
-            test_function,
-            "\n".join(steps_code),
-            test_function,
-            "\n".join(assertions),
-            test_function
+        assertions_code = "\n".join(assertions)
+        
+        # Test file content before and after the steps
+        test_header = _TEST_HEADER_TEMPLATE.format(
+            title_name=title_name,
+            test_description=test_description,
+            page_module=page_module,
+            page_class=page_class,
+            test_class=test_class,
+            test_function=test_function,
+            page_var=page_var
+        )
+        test_footer = _TEST_FOOTER_TEMPLATE.format(
+            test_function=test_function,
+            assertions_code=assertions_code
         )
         
-        # Write test file
+        # Render all steps with one join over the per-step blocks
+        steps_code = "".join(_render_step(step, page_var) for step in test_steps) if test_steps else ""
+        
+        # Write the test file in three buffered writes; an empty step section
+        # still leaves a blank line between the two halves
         test_file_path = self.tests_dir / "test_{}.py".format(test_function)
-        with open(test_file_path, 'w') as f:
-            f.write(test_content)
+        with open(test_file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(test_header)
+            f.write(steps_code or "\n")
+            f.write(test_footer)
         
         logger.info("Generated test file: {}".format(test_file_path))
         return str(test_file_path)
@@ -223,7 +344,8 @@ if __name__ == "__main__":
     def generate_page_object(self, 
                             page_name: str, 
                             page_url: str, 
-                            elements: Dict[str, List[Dict[str, Any]]]) -> str:
+                            elements: Dict[str, List[Dict[str, Any]]],
+                            idents: Optional[PageIdents] = None) -> str:
         """
         Generate a page object
         
@@ -231,136 +353,178 @@ if __name__ == "__main__":
             page_name: Name of the page
             page_url: URL of the page
             elements: Dictionary of elements by type
+            idents: Precomputed identifiers for page_name, derived if omitted
             
         Returns:
             str: Path to the generated page object file
         """
         logger.info("Generating page object for {}".format(page_name))
         
-        # Sanitize page name
-        sanitized_page_name = self.sanitize_name(page_name)
+        if idents is None:
+            idents = self.page_idents(page_name)
         
         # Prepare variables
-        page_class = "{}Page".format(sanitized_page_name.replace('_', ' ').title().replace(' ', ''))
+        page_class = idents.class_name
+        page_title = _title_name(page_name)
         
-        # Generate element selectors
-        element_selectors = []
+        inputs = elements.get("inputs", [])
+        buttons = elements.get("buttons", [])
+        links = elements.get("links", [])
+        
+        # Generate element selectors; unnamed elements are numbered by their
+        # position across all three categories
+        selectors_buf = io.StringIO()
         
         # Process inputs
-        for input_el in elements.get("inputs", []):
-            name = input_el.get("id") or input_el.get("name") or "{}_{}".format(input_el.get('type', 'input'), len(element_selectors) + 1)
+        input_names = []
+        for index, input_el in enumerate(inputs, 1):
+            name = input_el.get("id") or input_el.get("name") or f"{input_el.get('type', 'input')}_{index}"
             name = self.sanitize_name(name)
-            selector = input_el.get("css", "")
-            element_selectors.append('        self.{}_selector = "{}"'.format(name, selector))
+            input_names.append(name)
+            selectors_buf.write(f'        self.{name}_selector = "{input_el.get("css", "")}"\n')
         
         # Process buttons
-        for button in elements.get("buttons", []):
-            name = button.get("id") or button.get("text", "").lower().replace(' ', '_') or "button_{}".format(len(element_selectors) + 1)
+        button_names = []
+        for index, button in enumerate(buttons, len(inputs) + 1):
+            name = button.get("id") or button.get("text", "").lower().replace(' ', '_') or f"button_{index}"
             name = self.sanitize_name(name)
-            selector = button.get("css", "")
-            element_selectors.append('        self.{}_selector = "{}"'.format(name, selector))
+            button_names.append(name)
+            selectors_buf.write(f'        self.{name}_selector = "{button.get("css", "")}"\n')
         
         # Process links
-        for link in elements.get("links", []):
-            name = link.get("id") or link.get("text", "").lower().replace(' ', '_') or "link_{}".format(len(element_selectors) + 1)
+        link_names = []
+        for index, link in enumerate(links, len(inputs) + len(buttons) + 1):
+            name = link.get("id") or link.get("text", "").lower().replace(' ', '_') or f"link_{index}"
             name = self.sanitize_name(name)
-            selector = link.get("css", "")
-            element_selectors.append('        self.{}_selector = "{}"'.format(name, selector))
+            link_names.append(name)
+            selectors_buf.write(f'        self.{name}_selector = "{link.get("css", "")}"\n')
         
-        # Generate element methods
-        element_methods = []
+        element_selectors = selectors_buf.getvalue()[:-1]
+        
+        # Generate element methods, reusing the selector names from above;
+        # categories without elements get no section header
+        methods_buf = io.StringIO()
         
         # Methods for inputs
-        element_methods.append("    # Input methods")
-        for input_el in elements.get("inputs", []):
-            name = input_el.get("id") or input_el.get("name") or "{}_{}".format(input_el.get('type', 'input'), len(element_selectors) + 1)
-            name = self.sanitize_name(name)
-            method_name = "fill_{}".format(name)
-            
-            method_code = """
-    async def {}(self, value):
+        if input_names:
+            methods_buf.write("    # Input methods")
+        for name in input_names:
+            methods_buf.write(f"""
+
+    async def fill_{name}(self, value):
         \"\"\"
-        Fill {} input
+        Fill {name} input
         
         Args:
             value: Value to fill
         \"\"\"
-        await self.fill(self.{}_selector, value)""".format(method_name, name, name)
-            
-            element_methods.append(method_code)
+        await self.fill(self.{name}_selector, value)""")
         
         # Methods for buttons
-        element_methods.append("\n    # Button methods")
-        for button in elements.get("buttons", []):
-            name = button.get("id") or button.get("text", "").lower().replace(' ', '_') or "button_{}".format(len(element_selectors) + 1)
-            name = self.sanitize_name(name)
-            method_name = "click_{}".format(name)
-            
-            method_code = """
-    async def {}(self):
-        \"\"\"Click {} button\"\"\"
-        await self.click(self.{}_selector)""".format(method_name, name, name)
-            
-            element_methods.append(method_code)
+        if button_names:
+            methods_buf.write("\n\n    # Button methods" if methods_buf.tell() else "    # Button methods")
+        for name in button_names:
+            methods_buf.write(f"""
+
+    async def click_{name}(self):
+        \"\"\"Click {name} button\"\"\"
+        await self.click(self.{name}_selector)""")
         
         # Methods for links
-        element_methods.append("\n    # Link methods")
-        for link in elements.get("links", []):
-            name = link.get("id") or link.get("text", "").lower().replace(' ', '_') or "link_{}".format(len(element_selectors) + 1)
-            name = self.sanitize_name(name)
-            method_name = "click_{}".format(name)
-            
-            method_code = """
-    async def {}(self):
-        \"\"\"Click {} link\"\"\"
-        await self.click(self.{}_selector)""".format(method_name, name, name)
-            
-            element_methods.append(method_code)
+        if link_names:
+            methods_buf.write("\n\n    # Link methods" if methods_buf.tell() else "    # Link methods")
+        for name in link_names:
+            methods_buf.write(f"""
+
+    async def click_{name}(self):
+        \"\"\"Click {name} link\"\"\"
+        await self.click(self.{name}_selector)""")
+        
+        element_methods = methods_buf.getvalue()
         
         # Create page object content
-        page_content = '''"""
-{} Page Object
-======================
-Page object for {} page.
-"""
-
-from pages.base_page import BasePage
-
-class {}(BasePage):
-    """Page object for {} page"""
+        page_content = _PAGE_TEMPLATE.format(
+            page_title=page_title,
+            page_class=page_class,
+            page_url=page_url,
+            element_selectors=element_selectors,
+            element_methods=element_methods
+        )
+        
+        # Write page object file
+        page_file_path = self.pages_dir / "{}.py".format(idents.module_name)
+        page_file_path.write_text(page_content, encoding='utf-8')
+        
+        logger.info("Generated page object: {}".format(page_file_path))
+        return str(page_file_path)
     
-    def __init__(self, page):
+    def _generate_one_page(self, page_name: str, page_data: Dict[str, Any],
+                           idents: PageIdents) -> Tuple[str, str]:
         """
-        Initialize {} page object
+        Generate the page object and smoke test for one discovered page
         
         Args:
-            page: Playwright page object
+            page_name: Name of the page
+            page_data: Discovered URL and elements of the page
+            idents: Precomputed identifiers for page_name
+            
+        Returns:
+            Tuple[str, str]: Paths to the page object and test file
         """
-        super().__init__(page)
-        self.url = "{}"  # URL path relative to base URL
+        page_url = page_data.get("url", "")
+        elements = page_data.get("elements", {})
         
-        # Element selectors
-{}
-    
-{}
-'''.format(
-            page_name.replace('_', ' ').title(),
-            page_name.replace('_', ' ').title(),
-            page_class,
-            page_name.replace('_', ' ').title(),
-            page_name.replace('_', ' ').title(),
-            page_url,
-            "\n".join(element_selectors),
-            "\n".join(element_methods)
-        )
+        # Generate page object
+        page_file = self.generate_page_object(page_name, page_url, elements, idents)
         
-        # Write page object file
-        page_file_path = self.pages_dir / "{}_page.py".format(sanitized_page_name.lower())
-        with open(page_file_path, 'w') as f:
-            f.write(page_content)
+        # Generate test file
+        test_name = "{}_test".format(idents.sanitized.lower())
+        test_description = "Test for {} page".format(page_name)
         
-        logger.info("Generated page object: {}".format(page_file_path))
-        return str(page_file_path)
+        # Create test steps
+        test_steps = []
+        
+        # Add navigation step
+        test_steps.append({
+            "action": "navigate",
+            "target": page_url,
+            "description": "Navigate to {} page".format(page_name)
+        })
+        
+        # Add steps for inputs
+        for input_el in elements.get("inputs", [])[:2]:  # Limit to first 2 inputs
+            selector = input_el.get("css", "")
+            input_type = input_el.get("type", "")
+            
+            if input_type == "text" or input_type == "email":
+                test_steps.append({
+                    "action": "input",
+                    "selector": selector,
+                    "value": "test@example.com" if input_type == "email" else "test value",
+                    "description": "Fill {} field".format(input_el.get('id') or input_el.get('name') or 'input')
+                })
+            elif input_type == "password":
+                test_steps.append({
+                    "action": "input",
+                    "selector": selector,
+                    "value": "password123",
+                    "description": "Fill password field"
+                })
+        
+        # Add steps for buttons
+        for button in elements.get("buttons", [])[:1]:  # Limit to first button
+            selector = button.get("css", "")
+            test_steps.append({
+                "action": "click",
+                "selector": selector,
+                "description": "Click {}".format(button.get('text') or button.get('id') or 'button')
+            })
+        
+        # Generate test file
+        test_file = self.generate_test_file(test_name, test_description, page_name, page_url, test_steps, idents)
+        
+        return page_file, test_file
+    
     
     def generate_from_discovery_results(self, discovery_results_path: str) -> Dict[str, Any]:
         """
@@ -375,8 +539,7 @@ class {}(BasePage):
         logger.info("Generating from discovery results: {}".format(discovery_results_path))
         
         # Load discovery results
-        with open(discovery_results_path, 'r') as f:
-            discovery_results = json.load(f)
+        discovery_results = _load_json(discovery_results_path)
         
         # Extract data
         application_url = discovery_results.get("application_url", discovery_results.get("page_url", ""))
@@ -405,61 +568,34 @@ class {}(BasePage):
             "test_files": []
         }
         
-        for page_name, page_data in page_elements.items():
-            page_url = page_data.get("url", "")
-            elements = page_data.get("elements", {})
-            
-            # Generate page object
-            page_file = self.generate_page_object(page_name, page_url, elements)
+        page_idents = {page_name: self.page_idents(page_name) for page_name in page_elements}
+        page_names = list(page_elements)
+        
+        # Pages are independent, so larger sets are generated in worker processes
+        if len(page_names) >= PARALLEL_PAGE_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(page_names))) as executor:
+                results = list(executor.map(
+                    self._generate_one_page,
+                    page_names,
+                    [page_elements[page_name] for page_name in page_names],
+                    [page_idents[page_name] for page_name in page_names]
+                ))
+        else:
+            results = [
+                self._generate_one_page(page_name, page_elements[page_name], page_idents[page_name])
+                for page_name in page_names
+            ]
+        
+        for page_file, test_file in results:
             generated_files["page_objects"].append(page_file)
-            
-            # Generate test file
-            test_name = "{}_test".format(self.sanitize_name(page_name).lower())
-            test_description = "Test for {} page".format(page_name)
-            
-            # Create test steps
-            test_steps = []
-            
-            # Add navigation step
-            test_steps.append({
-                "action": "navigate",
-                "target": page_url,
-                "description": "Navigate to {} page".format(page_name)
-            })
-            
-            # Add steps for inputs
-            for input_el in elements.get("inputs", [])[:2]:  # Limit to first 2 inputs
-                selector = input_el.get("css", "")
-                input_type = input_el.get("type", "")
-                
-                if input_type == "text" or input_type == "email":
-                    test_steps.append({
-                        "action": "input",
-                        "selector": selector,
-                        "value": "test@example.com" if input_type == "email" else "test value",
-                        "description": "Fill {} field".format(input_el.get('id') or input_el.get('name') or 'input')
-                    })
-                elif input_type == "password":
-                    test_steps.append({
-                        "action": "input",
-                        "selector": selector,
-                        "value": "password123",
-                        "description": "Fill password field"
-                    })
-            
-            # Add steps for buttons
-            for button in elements.get("buttons", [])[:1]:  # Limit to first button
-                selector = button.get("css", "")
-                test_steps.append({
-                    "action": "click",
-                    "selector": selector,
-                    "description": "Click {}".format(button.get('text') or button.get('id') or 'button')
-                })
-            
-            # Generate test file
-            test_file = self.generate_test_file(test_name, test_description, page_name, page_url, test_steps)
             generated_files["test_files"].append(test_file)
         
+        # Map page URLs to page names once for the workflow lookups below;
+        # the first page listed for a URL wins, as with a linear search
+        url_to_page = {}
+        for page_name, page_data in page_elements.items():
+            url_to_page.setdefault(page_data.get("url"), page_name)
+        
         # Generate workflow tests if available
         for workflow in workflows:
             workflow_name = workflow.get("name", "").lower().replace(' ', '_')
@@ -472,11 +608,7 @@ class {}(BasePage):
                 first_page_url = first_step.get("target", "")
                 
                 # Find the page name for the first page
-                first_page_name = None
-                for page_name, page_data in page_elements.items():
-                    if page_data.get("url") == first_page_url:
-                        first_page_name = page_name
-                        break
+                first_page_name = url_to_page.get(first_page_url)
                 
                 if first_page_name:
                     # Generate test file for workflow
@@ -485,7 +617,8 @@ class {}(BasePage):
                         workflow_description or "Test for {} workflow".format(workflow_name),
                         first_page_name,
                         first_page_url,
-                        workflow_steps
+                        workflow_steps,
+                        page_idents[first_page_name]
                     )
                     generated_files["test_files"].append(test_file)
         
@@ -507,14 +640,22 @@ def find_discovery_results():
     ]
     
     for location in locations:
-        if not location.exists():
+        # Find discovery results files, reusing the stat from the directory scan
+        try:
+            with os.scandir(location) as entries:
+                candidates = [
+                    (entry.stat().st_mtime, entry.path)
+                    for entry in entries
+                    if entry.name.startswith("discovery_results_")
+                    and entry.name.endswith(".json")
+                    and entry.is_file()
+                ]
+        except (FileNotFoundError, NotADirectoryError):
             continue
-            
-        # Find discovery results files
-        files = list(location.glob("discovery_results_*.json"))
-        if files:
+        
+        if candidates:
             # Return the most recent file
-            return sorted(files, key=lambda f: f.stat().st_mtime, reverse=True)[0]
+            return Path(max(candidates)[1])
     
     return None
 
@@ -553,12 +694,10 @@ def main():
     
     # Print generated files
     print("\nGenerated page objects:")
-    for page_file in generated_files['page_objects']:
-        print("  - {}".format(page_file))
+    sys.stdout.writelines("  - {}\n".format(page_file) for page_file in generated_files['page_objects'])
     
     print("\nGenerated test files:")
-    for test_file in generated_files['test_files']:
-        print("  - {}".format(test_file))
+    sys.stdout.writelines("  - {}\n".format(test_file) for test_file in generated_files['test_files'])
     
     print("\nTo run the tests:")
     print("  pytest {}".format(" ".join(generated_files['test_files'])))